@@ -1,127 +1,523 @@
+import atexit
+import io
+import itertools
 import json
+import mimetypes
+import os
+import threading
+import time
 import urllib.error
 import urllib.request
-from datetime import datetime, timezone
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from dataclasses import dataclass, field, replace
+from email.message import Message
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from stat import S_ISREG
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import urllib3
+except ImportError:  # pragma: no cover - optional speedup
+    urllib3 = None
+
 
 BASE_DIR = Path(__file__).resolve().parent
 HISTORY_PATH = BASE_DIR / "history.json"
+# Mutations are appended here as JSON lines and folded into history.json periodically.
+HISTORY_LOG = BASE_DIR / "history.log"
+HISTORY_LOG_COMPACT_AT = 500
+# Log appends are buffered this long (seconds) so a burst of mutations costs one write.
+HISTORY_FLUSH_DELAY = 0.05
 STATIC_DIR = BASE_DIR / "public"
-
-
-def entry_fingerprint(entry: dict) -> Tuple[str, str, Tuple[Tuple[str, str], ...], str]:
-    headers = entry.get("headers") or {}
-    normalized_headers = {str(k).strip(): str(v).strip() for k, v in headers.items()}
-    headers_tuple = tuple(sorted(normalized_headers.items()))
+# Response bodies beyond this size are truncated rather than buffered in full.
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+# Only the first this-many response headers are passed back to the client.
+MAX_RESPONSE_HEADERS = 64
+# Set LITEMAN_PRETTY=1 to keep history.json indented for hand editing.
+PRETTY_HISTORY = bool(os.environ.get("LITEMAN_PRETTY"))
+
+if orjson is not None:
+
+    def _dumps(obj, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    _loads = orjson.loads
+else:  # pragma: no cover
+
+    def _json_default(obj):
+        if isinstance(obj, Entry):
+            return obj.to_dict()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps(obj, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_json_default).encode("utf-8")
+
+    def _loads(data):
+        return json.loads(bytes(data))
+
+
+if urllib3 is not None:
+    # Keep-alive pool so repeat calls to the same host skip the TCP/TLS handshake.
+    # Only redirects are retried, mirroring urllib's default redirect handling.
+    _POOL = urllib3.PoolManager(
+        num_pools=32,
+        maxsize=8,
+        retries=urllib3.Retry(
+            total=None, connect=0, read=0, redirect=10, status=0, other=0, raise_on_redirect=False
+        ),
+        timeout=urllib3.Timeout(connect=5, read=30),
+    )
+else:  # pragma: no cover
+    _POOL = None
+
+
+# Free list of scratch buffers for request bodies up to this many bytes; larger bodies get a
+# one-off buffer. A shared list rather than a threading.local, since the server spawns a
+# thread per request.
+_BODY_BUFFER_SIZE = 64 * 1024
+_BODY_BUFFERS: List[bytearray] = []
+
+
+# Parsed history keyed by the (mtime_ns, size) of history.json and history.log,
+# plus fingerprint -> list index and id -> list index maps over that history.
+# "seq" is the sequence number of the last logged op applied; "version" bumps on every change.
+_HISTORY_CACHE: dict = {
+    "stat": None,
+    "data": None,
+    "fp_index": {},
+    "id_index": {},
+    "log_lines": 0,
+    "seq": 0,
+    "version": 0,
+}
+# Log lines applied in memory but not yet written, and the timer that will write them.
+_PENDING_LOG: dict = {"lines": [], "timer": None}
+# Encoded GET /api/history body for the cache version it was built from.
+_HISTORY_RESP: dict = {"version": -1, "bytes": b""}
+# Guards _HISTORY_CACHE and the history files; re-entrant so mutators can hold it across load/save.
+_HISTORY_LOCK = threading.RLock()
+
+
+@dataclass(slots=True)
+class Entry:
+    id: str
+    timestamp: str
+    method: str
+    url: str
+    headers: Dict[str, str]
+    body: str
+    response_status: int = 0
+    name: str = ""
+    # Memoized entry_fingerprint; underscore fields are skipped by orjson and by to_dict.
+    _fp: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Entry":
+        return cls(
+            id=str(data.get("id") or ""),
+            timestamp=data.get("timestamp") or "",
+            method=(data.get("method") or "").upper(),
+            url=(data.get("url") or "").strip(),
+            headers=canonical_headers(data.get("headers") or {}),
+            body=data.get("body") or "",
+            response_status=data.get("response_status") or 0,
+            name=data.get("name") or "",
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "method": self.method,
+            "url": self.url,
+            "headers": self.headers,
+            "body": self.body,
+            "response_status": self.response_status,
+            "name": self.name,
+        }
+
+
+def canonical_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {str(k).strip(): str(v).strip() for k, v in headers.items()}
+
+
+def _iso_now() -> str:
+    # Same shape as datetime.now(timezone.utc).isoformat(), without building a datetime.
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    t = time.gmtime(seconds)
     return (
-        (entry.get("method") or "").upper(),
-        (entry.get("url") or "").strip(),
-        headers_tuple,
-        entry.get("body") or "",
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{nanos // 1000:06d}+00:00"
     )
 
 
-def load_history() -> List[dict]:
-    if not HISTORY_PATH.exists():
-        return []
+def entry_fingerprint(entry: Entry) -> Tuple[str, str, Tuple[Tuple[str, str], ...], str]:
+    fingerprint = entry._fp
+    if fingerprint is not None:
+        return fingerprint
+    # Entries are canonicalized on the way in (from_dict and /api/send), so no normalizing here.
+    fingerprint = (entry.method, entry.url, tuple(sorted(entry.headers.items())), entry.body)
+    entry._fp = fingerprint
+    return fingerprint
+
+
+def _reindex(history: List[Entry], fp_index: Dict[tuple, int], id_index: Dict[str, int], start: int = 0) -> None:
+    for idx in range(start, len(history)):
+        entry = history[idx]
+        fp_index[entry_fingerprint(entry)] = idx
+        id_index[entry.id] = idx
+
+
+def _file_stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _history_stat() -> tuple:
+    return _file_stat(HISTORY_PATH), _file_stat(HISTORY_LOG)
+
+
+def _read_history() -> Tuple[List[Entry], Dict[tuple, int], Dict[str, int], int, int]:
+    unique: List[Entry] = []
+    fp_index: Dict[tuple, int] = {}
+    id_index: Dict[str, int] = {}
     try:
-        with HISTORY_PATH.open("r", encoding="utf-8") as handle:
-            entries = json.load(handle)
-    except json.JSONDecodeError:
-        return []
-    unique: List[dict] = []
-    seen = set()
-    for entry in entries:
+        snapshot = _loads(HISTORY_PATH.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        snapshot = []
+    # Older snapshots are a bare list of entries with no sequence number.
+    if isinstance(snapshot, dict):
+        seq, entries = snapshot.get("seq") or 0, snapshot.get("history") or []
+    else:
+        seq, entries = 0, snapshot
+    for entry in map(Entry.from_dict, entries):
         fingerprint = entry_fingerprint(entry)
-        if fingerprint in seen:
+        if fingerprint in fp_index:
             continue
-        seen.add(fingerprint)
+        fp_index[fingerprint] = id_index[entry.id] = len(unique)
         unique.append(entry)
-    return unique
-
 
-def save_history(history: List[dict]) -> None:
-    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with HISTORY_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(history, handle, indent=2)
+    log_lines = 0
+    try:
+        raw_log = HISTORY_LOG.read_bytes()
+    except FileNotFoundError:
+        raw_log = b""
+    for line in raw_log.splitlines():
+        try:
+            op = _loads(line)
+        except json.JSONDecodeError:
+            continue  # Torn write from a crash mid-append.
+        # Ops at or below the snapshot's seq are already folded into it; this happens when a
+        # crash lands between writing a new snapshot and removing the old log.
+        op_seq = op.get("seq") or 0
+        if op_seq and op_seq <= seq:
+            continue
+        _apply_op(unique, fp_index, id_index, op)
+        seq = max(seq, op_seq)
+        log_lines += 1
+    return unique, fp_index, id_index, log_lines, seq
+
+
+def _refresh_history() -> None:
+    stat = _history_stat()
+    if _HISTORY_CACHE["data"] is None or _HISTORY_CACHE["stat"] != stat:
+        data, fp_index, id_index, log_lines, seq = _read_history()
+        _HISTORY_CACHE.update(
+            stat=stat, data=data, fp_index=fp_index, id_index=id_index, log_lines=log_lines, seq=seq
+        )
+        _HISTORY_CACHE["version"] += 1
+
+
+def _history() -> List[Entry]:
+    """Return the live cached history list; callers must hold _HISTORY_LOCK."""
+    _refresh_history()
+    return _HISTORY_CACHE["data"]
+
+
+def load_history() -> List[Entry]:
+    with _HISTORY_LOCK:
+        return list(_history())
+
+
+def history_response_body() -> bytes:
+    with _HISTORY_LOCK:
+        _refresh_history()
+        if _HISTORY_RESP["version"] != _HISTORY_CACHE["version"]:
+            body = _dumps({"history": _HISTORY_CACHE["data"]})
+            _HISTORY_RESP.update(version=_HISTORY_CACHE["version"], bytes=body)
+        return _HISTORY_RESP["bytes"]
+
+
+def save_history(
+    history: List[Entry],
+    fp_index: Optional[Dict[tuple, int]] = None,
+    id_index: Optional[Dict[str, int]] = None,
+) -> None:
+    with _HISTORY_LOCK:
+        # Make sure "seq" reflects the log on disk before stamping it into the snapshot.
+        _refresh_history()
+        HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        data = _dumps({"seq": _HISTORY_CACHE["seq"], "history": history}, pretty=PRETTY_HISTORY)
+        # Write to a sibling temp file and swap it in so a crash never leaves a half-written history.
+        tmp_path = HISTORY_PATH.with_suffix(".json.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, HISTORY_PATH)
+        _cancel_flush()
+        # The snapshot's seq covers every logged op, so if a crash leaves the old log behind,
+        # _read_history skips its lines instead of replaying them.
+        HISTORY_LOG.unlink(missing_ok=True)
+        if fp_index is None or id_index is None:
+            fp_index, id_index = {}, {}
+            _reindex(history, fp_index, id_index)
+        _HISTORY_CACHE.update(
+            stat=_history_stat(), data=list(history), fp_index=fp_index, id_index=id_index, log_lines=0
+        )
+        _HISTORY_CACHE["version"] += 1
+
+
+def _append_log(line: bytes) -> None:
+    _PENDING_LOG["lines"].append(line)
+    _HISTORY_CACHE["log_lines"] += 1
+    if _HISTORY_CACHE["log_lines"] >= HISTORY_LOG_COMPACT_AT:
+        save_history(_HISTORY_CACHE["data"], _HISTORY_CACHE["fp_index"], _HISTORY_CACHE["id_index"])
+    elif _PENDING_LOG["timer"] is None:
+        timer = threading.Timer(HISTORY_FLUSH_DELAY, flush_history)
+        timer.daemon = True
+        _PENDING_LOG["timer"] = timer
+        timer.start()
+
+
+def _cancel_flush() -> None:
+    if _PENDING_LOG["timer"] is not None:
+        _PENDING_LOG["timer"].cancel()
+        _PENDING_LOG["timer"] = None
+    _PENDING_LOG["lines"].clear()
+
+
+def flush_history() -> None:
+    with _HISTORY_LOCK:
+        lines = _PENDING_LOG["lines"]
+        _PENDING_LOG["timer"] = None
+        if not lines:
+            return
+        HISTORY_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with HISTORY_LOG.open("ab") as handle:
+            handle.write(b"".join(lines))
+            handle.flush()
+            os.fsync(handle.fileno())
+        lines.clear()
+        _HISTORY_CACHE["stat"] = _history_stat()
 
 
-def remove_entry(entry_id: str) -> bool:
-    history = load_history()
-    new_history = [item for item in history if str(item.get("id")) != str(entry_id)]
-    if len(new_history) == len(history):
-        return False
-    save_history(new_history)
-    return True
+atexit.register(flush_history)
 
 
-def rename_entry(entry_id: str, name: str) -> bool:
-    history = load_history()
-    found = False
-    for item in history:
-        if str(item.get("id")) == str(entry_id):
-            item["name"] = name
-            found = True
-            break
-    if found:
-        save_history(history)
-    return found
-
-
-def reorder_entries(order: List[str]) -> List[dict]:
-    history = load_history()
-    by_id = {str(item.get("id")): item for item in history}
-    new_history: List[dict] = []
-    seen = set()
-    for entry_id in order:
-        entry = by_id.get(str(entry_id))
-        if entry and entry_id not in seen:
-            new_history.append(entry)
-            seen.add(entry_id)
-    for entry in history:
-        entry_id = str(entry.get("id"))
-        if entry_id not in seen:
-            new_history.append(entry)
-            seen.add(entry_id)
-    save_history(new_history)
-    return new_history
-
-
-def record_entry(entry: dict) -> dict:
-    history = load_history()
+def _commit_op(op: dict) -> bool:
+    with _HISTORY_LOCK:
+        history = _history()
+        seq = _HISTORY_CACHE["seq"] + 1
+        line = _dumps({**op, "seq": seq}) + b"\n"
+        try:
+            changed = _apply_op(history, _HISTORY_CACHE["fp_index"], _HISTORY_CACHE["id_index"], op)
+            if changed:
+                _HISTORY_CACHE["seq"] = seq
+                _HISTORY_CACHE["version"] += 1
+                _append_log(line)
+        except BaseException:
+            # The in-memory copy may now be ahead of disk; persist what was already
+            # applied and force a re-read next time.
+            flush_history()
+            _HISTORY_CACHE["data"] = None
+            raise
+        return changed
+
+
+def _apply_op(history: List[Entry], fp_index: Dict[tuple, int], id_index: Dict[str, int], op: dict) -> bool:
+    kind = op.get("op")
+    if kind == "record":
+        _apply_record(history, fp_index, id_index, Entry.from_dict(op["entry"]))
+        return True
+    if kind == "delete":
+        idx = id_index.pop(str(op["id"]), None)
+        if idx is None:
+            return False
+        fp_index.pop(entry_fingerprint(history[idx]), None)
+        del history[idx]
+        # Only entries after the removed one shifted position.
+        _reindex(history, fp_index, id_index, start=idx)
+        return True
+    if kind == "rename":
+        idx = id_index.get(str(op["id"]))
+        if idx is None:
+            return False
+        history[idx].name = op["name"]
+        return True
+    if kind == "reorder":
+        _apply_reorder(history, id_index, op["order"])
+        fp_index.clear()
+        id_index.clear()
+        _reindex(history, fp_index, id_index)
+        return True
+    return False
+
+
+def _apply_reorder(history: List[Entry], id_index: Dict[str, int], order: List[str]) -> None:
+    # dict.fromkeys drops repeated ids while keeping their first position.
+    picked = [id_index[entry_id] for entry_id in dict.fromkeys(map(str, order)) if entry_id in id_index]
+    picked_set = set(picked)
+    history[:] = [history[idx] for idx in picked] + [
+        item for idx, item in enumerate(history) if idx not in picked_set
+    ]
+
+
+def _apply_record(
+    history: List[Entry], fp_index: Dict[tuple, int], id_index: Dict[str, int], entry: Entry
+) -> None:
     fingerprint = entry_fingerprint(entry)
 
-    # Remove existing entry with the same request signature.
-    existing_index = next((idx for idx, item in enumerate(history) if entry_fingerprint(item) == fingerprint), None)
+    # Replace existing entry with the same request signature.
+    existing_index = fp_index.get(fingerprint)
     if existing_index is not None:
         previous = history[existing_index]
-        merged = {**previous, **entry}
         # Preserve original id and name if not overwritten.
-        merged["id"] = previous.get("id") or entry.get("id")
-        if not merged.get("name") and previous.get("name"):
-            merged["name"] = previous.get("name")
+        merged = replace(entry, id=previous.id or entry.id, name=entry.name or previous.name)
+        merged._fp = fingerprint
         history[existing_index] = merged
+        if merged.id != previous.id:
+            id_index.pop(previous.id, None)
+            id_index[merged.id] = existing_index
     else:
         history.append(entry)
+        fp_index[fingerprint] = id_index[entry.id] = len(history) - 1
+
+    if len(history) > 100:
+        # Fingerprints and ids are unique per entry, so only the dropped tail needs unindexing.
+        for dropped in history[100:]:
+            fp_index.pop(entry_fingerprint(dropped), None)
+            id_index.pop(dropped.id, None)
+        del history[100:]
+
+
+def remove_entry(entry_id: str) -> bool:
+    return _commit_op({"op": "delete", "id": str(entry_id)})
+
+
+def rename_entry(entry_id: str, name: str) -> bool:
+    return _commit_op({"op": "rename", "id": str(entry_id), "name": name})
+
+
+def find_entry(entry_id: str) -> Optional[Entry]:
+    with _HISTORY_LOCK:
+        history = _history()
+        idx = _HISTORY_CACHE["id_index"].get(str(entry_id))
+        # A copy, so callers can edit it outside the lock and persist it through record_entry.
+        return replace(history[idx]) if idx is not None else None
+
 
-    history = history[:100]
-    save_history(history)
+def reorder_entries(order: List[str]) -> List[Entry]:
+    with _HISTORY_LOCK:
+        _commit_op({"op": "reorder", "order": [str(i) for i in order]})
+        return list(_history())
+
+
+def record_entry(entry: Entry) -> Entry:
+    _commit_op({"op": "record", "entry": entry.to_dict()})
     return entry
 
 
 def send_external_request(
     method: str, url: str, headers: Dict[str, str], body: Union[str, bytes, None]
-) -> Tuple[int, Dict[str, str], str]:
+) -> Tuple[int, List[Tuple[str, str]], str, bool]:
     data: Union[bytes, None]
     if body:
         data = body if isinstance(body, bytes) else body.encode("utf-8")
     else:
         data = None
 
+    if _POOL is None:
+        return _send_with_urllib(method, url, headers, data)
+
+    try:
+        response = _POOL.request(method.upper(), url, body=data, headers=headers, preload_content=False)
+    except urllib3.exceptions.HTTPError as exc:
+        reason = exc.reason if isinstance(exc, urllib3.exceptions.MaxRetryError) else exc
+        return 599, [], f"Request failed: {reason}", False
+
+    try:
+        response_body, truncated = _read_capped(response)
+    except urllib3.exceptions.HTTPError as exc:
+        response.close()
+        response.release_conn()
+        return 599, [], f"Request failed: {exc}", False
+    if truncated:
+        # Unread bytes would poison the pooled connection; drop it instead.
+        response.close()
+    response.release_conn()
+
+    charset = _content_charset(response.headers.get("Content-Type"))
+    decoded_body = response_body.decode(charset or "utf-8", errors="replace")
+    return response.status, _header_pairs(response.headers), decoded_body, truncated
+
+
+def _read_capped(response, chunk_size: int = 65536) -> Tuple[bytes, bool]:
+    buffer = bytearray()
+    chunk = response.read(chunk_size)
+    while chunk:
+        buffer.extend(chunk)
+        if len(buffer) > MAX_RESPONSE_BYTES:
+            del buffer[MAX_RESPONSE_BYTES:]
+            return bytes(buffer), True
+        chunk = response.read(chunk_size)
+    return bytes(buffer), False
+
+
+def _header_pairs(headers) -> List[Tuple[str, str]]:
+    return list(itertools.islice(headers.items(), MAX_RESPONSE_HEADERS))
+
+
+def headers_to_dict(pairs: Iterable[Tuple[str, str]]) -> Dict[str, Union[str, List[str]]]:
+    # Repeated headers such as Set-Cookie keep every value, as a list.
+    result: Dict[str, Union[str, List[str]]] = {}
+    for key, value in pairs:
+        existing = result.get(key)
+        if existing is None:
+            result[key] = value
+        elif isinstance(existing, list):
+            existing.append(value)
+        else:
+            result[key] = [existing, value]
+    return result
+
+
+def _content_charset(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    message = Message()
+    message["Content-Type"] = content_type
+    return message.get_content_charset()
+
+
+def _send_with_urllib(
+    method: str, url: str, headers: Dict[str, str], data: Union[bytes, None]
+) -> Tuple[int, List[Tuple[str, str]], str, bool]:
     request = urllib.request.Request(url, data=data, method=method.upper())
     for key, value in headers.items():
         request.add_header(key, value)
@@ -130,22 +526,47 @@ def send_external_request(
 
     try:
         with urllib.request.urlopen(request) as response:
-            response_body = response.read()
+            response_body, truncated = _read_capped(response)
             status_code = response.status
-            response_headers = dict(response.headers.items())
+            response_headers = _header_pairs(response.headers)
             charset = response.headers.get_content_charset()
     except urllib.error.HTTPError as exc:
-        response_body = exc.read()
+        response_body, truncated = _read_capped(exc)
         status_code = exc.code
-        response_headers = dict(exc.headers.items()) if exc.headers else {}
+        response_headers = _header_pairs(exc.headers) if exc.headers else []
         if exc.headers:
             charset = exc.headers.get_content_charset()
     except urllib.error.URLError as exc:
         message = f"Request failed: {exc.reason}"
-        return 599, {}, message
+        return 599, [], message, False
 
     decoded_body = response_body.decode(charset or "utf-8", errors="replace")
-    return status_code, response_headers, decoded_body
+    return status_code, response_headers, decoded_body, truncated
+
+
+# Fixed error replies, encoded once at import time.
+_ERROR_BODIES = {
+    message: _dumps({"error": message})
+    for message in ("not found", "url is required", "id is required", "request not found", "order must be a list")
+}
+
+
+# Static files up to this size are kept in memory; larger ones are streamed by the base class.
+STATIC_CACHE_MAX_BYTES = 1024 * 1024
+# path -> (mtime_ns, size, body, content_type, etag). An edited file replaces its own slot.
+_STATIC_CACHE: Dict[str, Tuple[int, int, bytes, str, str]] = {}
+
+
+def _static_asset(path: str, mtime_ns: int, size: int) -> Tuple[bytes, str, str]:
+    cached = _STATIC_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+        return cached[2], cached[3], cached[4]
+    with open(path, "rb") as handle:
+        body = handle.read()
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    etag = f'"{mtime_ns:x}-{size:x}"'
+    _STATIC_CACHE[path] = (mtime_ns, size, body, content_type, etag)
+    return body, content_type, etag
 
 
 class ApiHandler(SimpleHTTPRequestHandler):
@@ -162,16 +583,33 @@ class ApiHandler(SimpleHTTPRequestHandler):
 
     def _json_body(self) -> dict:
         content_length = int(self.headers.get("Content-Length") or 0)
-        raw_body = self.rfile.read(content_length) if content_length else b""
-        if not raw_body:
+        if content_length <= 0:
             return {}
+        pooled = content_length <= _BODY_BUFFER_SIZE
+        if not pooled:
+            buffer = bytearray(content_length)
+        else:
+            try:
+                buffer = _BODY_BUFFERS.pop()
+            except IndexError:
+                buffer = bytearray(_BODY_BUFFER_SIZE)
         try:
-            return json.loads(raw_body.decode("utf-8"))
-        except json.JSONDecodeError:
-            return {}
+            with memoryview(buffer) as view:
+                received = self.rfile.readinto(view[:content_length])
+                if not received:
+                    return {}
+                try:
+                    return _loads(view[:received])
+                except json.JSONDecodeError:
+                    return {}
+        finally:
+            if pooled:
+                _BODY_BUFFERS.append(buffer)
 
     def _write_json(self, status: int, payload: dict) -> None:
-        encoded = json.dumps(payload).encode("utf-8")
+        self._write_precoded(status, _dumps(payload))
+
+    def _write_precoded(self, status: int, encoded: bytes) -> None:
         self.send_response(status)
         self._set_cors()
         self.send_header("Content-Type", "application/json")
@@ -188,127 +626,172 @@ class ApiHandler(SimpleHTTPRequestHandler):
         super().do_OPTIONS()
 
     def do_GET(self) -> None:  # noqa: N802
-        if self.path in ("/api/history", "/api/commands"):
-            history = load_history()
-            self._write_json(200, {"history": history})
+        route = self._GET_ROUTES.get(self.path)
+        if route is not None:
+            route(self)
             return
         super().do_GET()
 
     def do_POST(self) -> None:  # noqa: N802
-        if self.path == "/api/send":
-            payload = self._json_body()
-            url = payload.get("url")
-            method = (payload.get("method") or "GET").upper()
-            headers = payload.get("headers") or {}
-            body = payload.get("body") or ""
-            name = payload.get("name") or ""
-
-            if not url:
-                self._write_json(400, {"error": "url is required"})
-                return
-
-            status_code, response_headers, response_body = send_external_request(method, url, headers, body)
-
-            entry = {
-                "id": str(uuid4()),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "method": method,
-                "url": url,
-                "headers": headers,
-                "body": body,
-                "response_status": status_code,
-                "name": name,
-            }
-            record_entry(entry)
-
-            self._write_json(
-                200,
-                {
-                    "status": status_code,
-                    "response_headers": response_headers,
-                    "response_body": response_body,
-                    "saved": entry,
-                },
-            )
+        route = self._POST_ROUTES.get(self.path)
+        if route is not None:
+            route(self)
             return
+        self._write_precoded(404, _ERROR_BODIES["not found"])
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].split("#", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            file_stat = None
+        if file_stat is None or not S_ISREG(file_stat.st_mode) or file_stat.st_size > STATIC_CACHE_MAX_BYTES:
+            # Redirects, directory listings, 404s and large files stay with the base class.
+            return super().send_head()
+
+        body, content_type, etag = _static_asset(path, file_stat.st_mtime_ns, file_stat.st_size)
+        if_none_match = self.headers.get("If-None-Match") or ""
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+        self.send_response(200)
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(file_stat.st_mtime))
+        self.end_headers()
+        return io.BytesIO(body)
 
-        if self.path == "/api/resend":
-            payload = self._json_body()
-            target_id = payload.get("id")
-            if not target_id:
-                self._write_json(400, {"error": "id is required"})
-                return
-
-            history = load_history()
-            entry = next((item for item in history if item.get("id") == target_id), None)
-            if not entry:
-                self._write_json(404, {"error": "request not found"})
-                return
-
-            status_code, response_headers, response_body = send_external_request(
-                entry["method"], entry["url"], entry.get("headers", {}), entry.get("body", "")
-            )
-
-            entry["response_status"] = status_code
-            entry["timestamp"] = datetime.now(timezone.utc).isoformat()
-            record_entry(entry)
-
-            self._write_json(
-                200,
-                {
-                    "status": status_code,
-                    "response_headers": response_headers,
-                    "response_body": response_body,
-                    "saved": entry,
-                },
-            )
+    def _handle_history(self) -> None:
+        self._write_precoded(200, history_response_body())
+
+    def _handle_send(self) -> None:
+        payload = self._json_body()
+        url = (payload.get("url") or "").strip()
+        method = (payload.get("method") or "GET").upper()
+        headers = canonical_headers(payload.get("headers") or {})
+        body = payload.get("body") or ""
+        name = payload.get("name") or ""
+
+        if not url:
+            self._write_precoded(400, _ERROR_BODIES["url is required"])
             return
 
-        if self.path == "/api/delete":
-            payload = self._json_body()
-            target_id = payload.get("id")
-            if not target_id:
-                self._write_json(400, {"error": "id is required"})
-                return
+        status_code, response_headers, response_body, truncated = send_external_request(
+            method, url, headers, body
+        )
+
+        entry = Entry(
+            id=str(uuid4()),
+            timestamp=_iso_now(),
+            method=method,
+            url=url,
+            headers=headers,
+            body=body,
+            response_status=status_code,
+            name=name,
+        )
+        record_entry(entry)
+
+        self._write_json(
+            200,
+            {
+                "status": status_code,
+                "response_headers": headers_to_dict(response_headers),
+                "response_body": response_body,
+                "truncated": truncated,
+                "saved": entry,
+            },
+        )
+
+    def _handle_resend(self) -> None:
+        payload = self._json_body()
+        target_id = payload.get("id")
+        if not target_id:
+            self._write_precoded(400, _ERROR_BODIES["id is required"])
+            return
 
-            removed = remove_entry(str(target_id))
-            if not removed:
-                self._write_json(404, {"error": "request not found"})
-                return
+        entry = find_entry(str(target_id))
+        if not entry:
+            self._write_precoded(404, _ERROR_BODIES["request not found"])
+            return
 
-            self._write_json(200, {"deleted": target_id})
+        status_code, response_headers, response_body, truncated = send_external_request(
+            entry.method, entry.url, entry.headers, entry.body
+        )
+
+        entry.response_status = status_code
+        entry.timestamp = _iso_now()
+        record_entry(entry)
+
+        self._write_json(
+            200,
+            {
+                "status": status_code,
+                "response_headers": headers_to_dict(response_headers),
+                "response_body": response_body,
+                "truncated": truncated,
+                "saved": entry,
+            },
+        )
+
+    def _handle_delete(self) -> None:
+        payload = self._json_body()
+        target_id = payload.get("id")
+        if not target_id:
+            self._write_precoded(400, _ERROR_BODIES["id is required"])
             return
 
-        if self.path == "/api/rename":
-            payload = self._json_body()
-            target_id = payload.get("id")
-            name = payload.get("name") or ""
-            if not target_id:
-                self._write_json(400, {"error": "id is required"})
-                return
-            renamed = rename_entry(str(target_id), str(name))
-            if not renamed:
-                self._write_json(404, {"error": "request not found"})
-                return
-            self._write_json(200, {"renamed": target_id, "name": name})
+        removed = remove_entry(str(target_id))
+        if not removed:
+            self._write_precoded(404, _ERROR_BODIES["request not found"])
             return
 
-        if self.path == "/api/reorder":
-            payload = self._json_body()
-            order = payload.get("order") or []
-            if not isinstance(order, list):
-                self._write_json(400, {"error": "order must be a list"})
-                return
-            reordered = reorder_entries([str(i) for i in order])
-            self._write_json(200, {"history": reordered})
+        self._write_json(200, {"deleted": target_id})
+
+    def _handle_rename(self) -> None:
+        payload = self._json_body()
+        target_id = payload.get("id")
+        name = payload.get("name") or ""
+        if not target_id:
+            self._write_precoded(400, _ERROR_BODIES["id is required"])
+            return
+        renamed = rename_entry(str(target_id), str(name))
+        if not renamed:
+            self._write_precoded(404, _ERROR_BODIES["request not found"])
             return
+        self._write_json(200, {"renamed": target_id, "name": name})
 
-        self._write_json(404, {"error": "not found"})
+    def _handle_reorder(self) -> None:
+        payload = self._json_body()
+        order = payload.get("order") or []
+        if not isinstance(order, list):
+            self._write_precoded(400, _ERROR_BODIES["order must be a list"])
+            return
+        reordered = reorder_entries([str(i) for i in order])
+        self._write_json(200, {"history": reordered})
+
+    _GET_ROUTES = {
+        "/api/history": _handle_history,
+        "/api/commands": _handle_history,
+    }
+    _POST_ROUTES = {
+        "/api/send": _handle_send,
+        "/api/resend": _handle_resend,
+        "/api/delete": _handle_delete,
+        "/api/rename": _handle_rename,
+        "/api/reorder": _handle_reorder,
+    }
 
 
 def run_server(port: int = 8000) -> None:
     handler = lambda *args, **kwargs: ApiHandler(*args, directory=STATIC_DIR, **kwargs)  # noqa: E731
-    httpd = HTTPServer(("0.0.0.0", port), handler)
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    httpd.daemon_threads = True
     print(f"Server running at http://localhost:{port}")
     try:
         httpd.serve_forever()
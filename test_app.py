@@ -0,0 +1,108 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import app
+
+
+def _entry(entry_id: str, url: str, name: str = "") -> app.Entry:
+    return app.Entry(
+        id=entry_id,
+        timestamp="2024-01-01T00:00:00.000000+00:00",
+        method="GET",
+        url=url,
+        headers={},
+        body="",
+        name=name,
+    )
+
+
+class HistoryLogReplayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        base = Path(tmp.name)
+        for patcher in (
+            mock.patch.object(app, "HISTORY_PATH", base / "history.json"),
+            mock.patch.object(app, "HISTORY_LOG", base / "history.log"),
+            mock.patch.object(app, "HISTORY_LOG_COMPACT_AT", 10**6),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self._reset_cache)
+        self._reset_cache()
+
+    def _reset_cache(self) -> None:
+        with app._HISTORY_LOCK:
+            app._cancel_flush()
+            app._HISTORY_CACHE["data"] = None
+
+    def _reload(self) -> list:
+        self._reset_cache()
+        return [entry.to_dict() for entry in app.load_history()]
+
+    def _crash_during_compaction(self) -> list:
+        """Compact, then put the pre-compaction log back as if unlink never ran."""
+        app.flush_history()
+        stale_log = app.HISTORY_LOG.read_bytes()
+        app.save_history(app.load_history())
+        expected = [entry.to_dict() for entry in app.load_history()]
+        app.HISTORY_LOG.write_bytes(stale_log)
+        self.assertEqual(self._reload(), expected)
+        return expected
+
+    def test_stale_log_is_not_replayed_over_newer_snapshot(self) -> None:
+        app.record_entry(_entry("a", "http://example.test/", name="old"))
+        app.remove_entry("a")
+        app.record_entry(_entry("b", "http://example.test/"))
+
+        history = self._crash_during_compaction()
+
+        self.assertEqual([(item["id"], item["name"]) for item in history], [("b", "")])
+
+    def test_random_ops_survive_crash_during_compaction(self) -> None:
+        rnd = random.Random(1234)
+        ids = []
+        for step in range(300):
+            choice = rnd.random()
+            if choice < 0.5 or not ids:
+                entry_id = f"id{step}"
+                ids.append(entry_id)
+                url = f"http://example.test/{rnd.randint(0, 20)}"
+                app.record_entry(_entry(entry_id, url, rnd.choice(["", "n"])))
+            elif choice < 0.7:
+                app.remove_entry(rnd.choice(ids))
+            elif choice < 0.9:
+                app.rename_entry(rnd.choice(ids), f"r{step}")
+            else:
+                order = [entry.id for entry in app.load_history()]
+                rnd.shuffle(order)
+                app.reorder_entries(order[: len(order) // 2])
+            if step % 50 == 49:
+                self._crash_during_compaction()
+
+    def test_log_after_snapshot_is_replayed(self) -> None:
+        app.record_entry(_entry("a", "http://example.test/a"))
+        app.save_history(app.load_history())
+        app.rename_entry("a", "renamed")
+        app.record_entry(_entry("b", "http://example.test/b"))
+        app.flush_history()
+
+        history = self._reload()
+
+        self.assertEqual([(item["id"], item["name"]) for item in history], [("a", "renamed"), ("b", "")])
+
+    def test_legacy_list_snapshot_still_loads(self) -> None:
+        app.HISTORY_PATH.write_text('[{"id": "a", "method": "get", "url": " http://example.test/ "}]')
+
+        history = self._reload()
+
+        self.assertEqual(
+            [(item["id"], item["method"], item["url"]) for item in history], [("a", "GET", "http://example.test/")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()